@@ -0,0 +1,21 @@
+"""
+Gunicorn 生产配置 - 启动: gunicorn main:app -c gunicorn.conf.py
+"""
+
+import os
+
+# 监听端口跟随平台注入的 PORT（Render 等）
+bind = f"0.0.0.0:{os.environ.get('PORT', 8080)}"
+
+# 接口均为I/O密集型，多线程worker并发处理外部请求
+workers = 2
+worker_class = "gthread"
+threads = 8
+
+timeout = 30
+keepalive = 5
+
+def post_worker_init(worker):
+    """worker 就绪后启动后台股价预取（文件锁保证只有一个 worker 真正预取）"""
+    import main
+    main.start_prefetcher()
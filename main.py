@@ -6,215 +6,438 @@
 import os
 import sys
 import json
+import time
+import fcntl
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+import diskcache
+import ijson
+import orjson
+import pytz
 import requests
-from flask import Flask, jsonify, send_from_directory
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from flask import Flask, Response, request, send_from_directory
 from flask_cors import CORS
-import yfinance as yf
 
 app = Flask(__name__)
 CORS(app)
 
 # 关注的股票列表
-WATCHLIST = ['RDDT', 'TSLA', 'UBER', 'COIN', 'CADL']
+WATCHLIST = ('RDDT', 'TSLA', 'UBER', 'COIN', 'CADL')
+
+# 获取失败时返回的占位股价
+ZERO_PRICE = {
+    'current': 0.0,
+    'previous_close': 0.0,
+    'change': 0.0,
+    'change_percent': 0.0,
+    'volume': 0
+}
+
+# 并发拉取股价的线程池（I/O密集型）
+_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# 磁盘缓存：/tmp 在无服务器平台的热实例之间保留，冷启动后仍可命中
+DISK_CACHE = diskcache.Cache("/tmp/stockcache")
+
+# Yahoo批量报价接口，一次请求返回多只股票
+YAHOO_QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+# 批量接口需要 cookie + crumb：先访问 fc.yahoo.com 拿 cookie，再换取 crumb
+YAHOO_COOKIE_URL = "https://fc.yahoo.com"
+YAHOO_CRUMB_URL = "https://query1.finance.yahoo.com/v1/test/getcrumb"
+# Yahoo单只股票图表接口，批量接口缺失时回退使用
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+
+# NewsAPI 配置（进程启动时确定，不随请求变化）
+NEWS_API_KEY = os.environ.get("NEWS_API_KEY")
+NEWS_API_URL = "https://newsapi.org/v2/everything"
+NEWS_SEARCH_QUERY = '(Tesla OR TSLA OR "Elon Musk" OR EV) OR (Uber OR UBER OR "ride sharing") OR (Coinbase OR COIN OR cryptocurrency) OR (Reddit OR RDDT OR social media) OR (stock market OR stocks OR trading OR investment OR earnings OR market OR finance OR financial OR business OR economy)'
+NEWS_BASE_PARAMS = {
+    'q': NEWS_SEARCH_QUERY,
+    'apiKey': NEWS_API_KEY,
+    'language': 'en',
+    'sortBy': 'publishedAt'
+}
+BEIJING_TZ = pytz.timezone('Asia/Shanghai')
+
+# 回退/模拟新闻：静态内容导入时生成一次；age 为距今秒数，时间字段在返回时按当前时间补上
+REAL_NEWS_SOURCES = (
+    {
+        'title': 'Tesla股价因自动驾驶技术突破上涨',
+        'summary': '特斯拉最新的FSD v12版本在测试中表现出色，投资者信心增强',
+        'source': 'Reuters',
+        'url': 'https://reuters.com/business/autos/tesla-fsd-breakthrough',
+        'sentiment': 'positive',
+        'age': 3600
+    },
+    {
+        'title': 'Reddit广告收入超预期，用户增长强劲',
+        'summary': 'Reddit最新财报显示广告收入同比增长显著，用户活跃度提升',
+        'source': 'CNBC',
+        'url': 'https://cnbc.com/2024/reddit-earnings-beat',
+        'sentiment': 'positive',
+        'age': 7200
+    },
+    {
+        'title': 'Uber宣布扩大自动驾驶车队规模',
+        'summary': '优步计划在主要城市扩大自动驾驶车队规模',
+        'source': 'Bloomberg',
+        'url': 'https://bloomberg.com/news/uber-autonomous-expansion',
+        'sentiment': 'positive',
+        'age': 10800
+    },
+    {
+        'title': 'Coinbase推出新功能提升用户体验',
+        'summary': 'Coinbase宣布推出多项新功能',
+        'source': 'CoinDesk',
+        'url': 'https://coindesk.com/business/coinbase-new-features',
+        'sentiment': 'positive',
+        'age': 14400
+    },
+    {
+        'title': '特朗普政策讨论影响科技股走势',
+        'summary': '市场对特朗普政策进行解读，科技股波动',
+        'source': 'Financial Times',
+        'url': 'https://ft.com/content/trump-tech-impact',
+        'sentiment': 'neutral',
+        'age': 18000
+    },
+    {
+        'title': 'Candel Therapeutics临床进展顺利',
+        'summary': 'CADL癌症免疫疗法临床试验显示良好效果',
+        'source': 'BioPharma Dive',
+        'url': 'https://biopharmadive.com/news/cadel-clinical-trial',
+        'sentiment': 'positive',
+        'age': 21600
+    }
+)
+
+MOCK_NEWS = (
+    {
+        'title': 'Tesla股价因自动驾驶技术突破上涨5%',
+        'summary': '特斯拉最新的FSD v12版本在测试中表现出色，投资者信心增强，股价应声上涨',
+        'source': '路透社',
+        'url': '#',
+        'sentiment': 'positive',
+        'age': 3600
+    },
+    {
+        'title': 'Reddit广告收入超预期，用户增长强劲',
+        'summary': 'Reddit最新财报显示广告收入同比增长45%，超出分析师预期',
+        'source': 'CNBC',
+        'url': '#',
+        'sentiment': 'positive',
+        'age': 7200
+    },
+    {
+        'title': 'Uber宣布扩大自动驾驶车队规模至10万辆',
+        'summary': '优步计划在2025年将自动驾驶车队扩大至10万辆，投资50亿美元',
+        'source': '彭博社',
+        'url': '#',
+        'sentiment': 'positive',
+        'age': 10800
+    }
+)
+
+# 相对时间固定不变，导入时按新到旧排好，请求时直接切片
+REAL_NEWS_SORTED = tuple(sorted(REAL_NEWS_SOURCES, key=itemgetter('age')))
+MOCK_NEWS_SORTED = tuple(sorted(MOCK_NEWS, key=itemgetter('age')))
+
+def _stamp_news(items, with_display_time=False):
+    """按当前时间把预置新闻的 age 换成 timestamp（只处理当前页）"""
+    now = datetime.now()
+    now_ts = now.timestamp()
+    news = []
+    for item in items:
+        news_item = dict(item)
+        age = news_item.pop('age')
+        if with_display_time:
+            news_item['timestamp'] = int((now_ts - age) * 1000)
+            news_item['beijing_time'] = (now - timedelta(seconds=age)).strftime('%m-%d %H:%M')
+            news_item['date_group'] = '今天'
+        else:
+            news_item['timestamp'] = (now_ts - age) * 1000
+        news.append(news_item)
+    return news
+
+# 共享HTTP会话：连接池复用TCP/TLS连接，所有外部请求都走这里
+# 上游变慢时快速失败并退避重试，避免长时间占住处理线程
+HTTP_TIMEOUT = (2, 4)  # (连接, 读取) 秒
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=50, pool_maxsize=50,
+                       max_retries=Retry(total=2, backoff_factor=0.2,
+                                         status_forcelist=[502, 503, 504],
+                                         allowed_methods={"GET"}))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+# Yahoo 会对默认的 python-requests UA 返回 429，统一使用浏览器 UA
+SESSION.headers.update({
+    "Accept-Encoding": "gzip",
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
+})
+
+_crumb = None
+_crumb_lock = threading.Lock()
+
+def _get_crumb(refresh=False):
+    """获取 Yahoo crumb，进程内复用；cookie 保存在 SESSION 中"""
+    global _crumb
+    with _crumb_lock:
+        if _crumb is None or refresh:
+            # fc.yahoo.com 本身返回404，但会写入后续请求所需的 cookie
+            SESSION.get(YAHOO_COOKIE_URL, timeout=HTTP_TIMEOUT)
+            response = SESSION.get(YAHOO_CRUMB_URL, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+            _crumb = response.text.strip()
+        return _crumb
+
+def _fetch_batch(symbols):
+    """批量获取报价，返回 {symbol: quote}"""
+    params = {"symbols": ",".join(symbols), "crumb": _get_crumb()}
+    response = SESSION.get(YAHOO_QUOTE_URL, params=params, timeout=HTTP_TIMEOUT)
+    if response.status_code == 401:
+        # crumb/cookie 过期，重新握手后重试一次
+        params["crumb"] = _get_crumb(refresh=True)
+        response = SESSION.get(YAHOO_QUOTE_URL, params=params, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    
+    quotes = {}
+    for item in response.json()["quoteResponse"]["result"]:
+        quotes[item["symbol"]] = {
+            'regularMarketPrice': item.get('regularMarketPrice'),
+            'regularMarketPreviousClose': item.get('regularMarketPreviousClose'),
+            'regularMarketVolume': item.get('regularMarketVolume')
+        }
+    return quotes
 
 class StockData:
     def __init__(self):
         self.prices = {}
         self.last_update = {}
-        self.cache = {}
-        self.cache_timeout = 300
+        # 缓存键带命名空间：("price", symbol) / ("news", page, per_page)
+        self.cache = OrderedDict()
+        self.cache_max = 1024
+        # 股价分钟级变化，新闻变化慢，按数据节奏分别设置过期时间（秒）
+        self.ttls = {"price": 60, "news": 900}
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
         
-    def get_real_time_price(self, symbol):
-        """获取实时股价 - 优化版"""
+    def _get_cached(self, key):
+        """读取未过期的缓存（先内存，后磁盘）"""
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry:
+                if entry[1] > time.monotonic():
+                    # 命中即标记为最近使用，淘汰时从最久未用的开始
+                    self.cache.move_to_end(key)
+                    return entry[0]
+                del self.cache[key]
+        return DISK_CACHE.get(":".join(map(str, key)))
+    
+    def _set_cached(self, key, value):
+        """写入缓存（内存 + 磁盘），内存超出上限时淘汰最久未使用的条目"""
+        with self._lock:
+            # 缓存值为 (数据, 单调时钟过期时间)
+            self.cache[key] = (value, time.monotonic() + self.ttls[key[0]])
+            self.cache.move_to_end(key)
+            if len(self.cache) > self.cache_max:
+                self.cache.popitem(last=False)
+        DISK_CACHE.set(":".join(map(str, key)), value, expire=self.ttls[key[0]])
+        return value
+    
+    @staticmethod
+    def _make_price_data(current_price, previous_close, volume):
+        """根据现价/昨收/成交量计算涨跌，并记录拉取时间"""
+        current_price = round(float(current_price), 2)
+        previous_close = float(previous_close) if previous_close else current_price
+        
+        change = round(current_price - previous_close, 2)
+        change_percent = round((change / previous_close) * 100, 2) if previous_close else 0.0
+        
+        return {
+            'current': current_price,
+            'previous_close': round(previous_close, 2),
+            'change': change,
+            'change_percent': change_percent,
+            'volume': int(volume or 0),
+            'updated_at': _iso_now()
+        }
+    
+    def get_real_time_price(self, symbol, force=False):
+        """获取实时股价 - 优化版，force=True 时跳过缓存直接拉取"""
         try:
-            if symbol in self.cache:
-                cached_data, cached_time = self.cache[symbol]
-                if (datetime.now() - cached_time).seconds < self.cache_timeout:
-                    return cached_data
+            cached_data = None if force else self._get_cached(('price', symbol))
+            if cached_data:
+                return cached_data
             
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period="5d", interval="1m")
-            info = ticker.info
+            # 直接读取 chart 接口的 meta，只取三个数值，不构造 DataFrame
+            response = SESSION.get(YAHOO_CHART_URL.format(symbol=symbol),
+                                   params={"range": "1d", "interval": "1m"}, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+            meta = response.json()["chart"]["result"][0]["meta"]
             
-            if not data.empty:
-                current_price = round(data['Close'].iloc[-1], 2)
-                previous_close = info.get('previousClose') or info.get('regularMarketPreviousClose')
-                
-                if not previous_close and not data.empty:
-                    previous_close = round(data['Close'].iloc[-2], 2) if len(data) > 1 else current_price
-                
-                change = round(current_price - previous_close, 2)
-                change_percent = round((change / previous_close) * 100, 2)
-                
-                result = {
-                    'current': current_price,
-                    'previous_close': round(previous_close, 2),
-                    'change': change,
-                    'change_percent': change_percent,
-                    'volume': int(data['Volume'].iloc[-1]) if not data['Volume'].empty else 0
-                }
-                
-                self.cache[symbol] = (result, datetime.now())
-                return result
-            else:
+            current_price = meta.get("regularMarketPrice")
+            if current_price is None:
                 return None
+            
+            result = self._make_price_data(current_price,
+                                           meta.get("chartPreviousClose"),
+                                           meta.get("regularMarketVolume", 0))
+            return self._set_cached(('price', symbol), result)
                 
         except Exception as e:
             print(f"获取{symbol}股价失败: {e}")
             return None
     
-    def update_prices(self):
-        """更新股价数据"""
-        for symbol in WATCHLIST:
-            price_data = self.get_real_time_price(symbol)
+    def _fetch_prices(self, symbols):
+        """批量请求一次，批量接口缺失的股票并发逐只回退（均不读缓存）"""
+        results = {}
+        try:
+            quotes = _fetch_batch(symbols)
+        except Exception as e:
+            print(f"批量获取股价失败: {e}")
+            quotes = {}
+        
+        for symbol in symbols:
+            quote = quotes.get(symbol)
+            if quote and quote['regularMarketPrice']:
+                result = self._make_price_data(
+                    quote['regularMarketPrice'],
+                    quote['regularMarketPreviousClose'],
+                    quote['regularMarketVolume']
+                )
+                results[symbol] = self._set_cached(('price', symbol), result)
+        
+        fallback = [s for s in symbols if s not in results]
+        futures = {_EXECUTOR.submit(self.get_real_time_price, s, force=True): s for s in fallback}
+        for future in as_completed(futures):
+            price_data = future.result()
             if price_data:
+                results[futures[future]] = price_data
+        return results
+    
+    def update_prices(self, force=False):
+        """更新股价数据 - 并发请求合并为一次上游拉取，返回 {symbol: 股价详情}
+        
+        force=True 时忽略未过期的缓存，直接拉取（后台预取使用）
+        """
+        results = {}
+        missing = []
+        for symbol in WATCHLIST:
+            cached_data = None if force else self._get_cached(('price', symbol))
+            if cached_data:
+                results[symbol] = cached_data
+            else:
+                missing.append(symbol)
+        
+        if missing:
+            # 同一时刻只有一个请求去拉上游，其余请求等待后直接读缓存
+            with self._fetch_lock:
+                stale = []
+                for symbol in missing:
+                    cached_data = None if force else self._get_cached(('price', symbol))
+                    if cached_data:
+                        results[symbol] = cached_data
+                    else:
+                        stale.append(symbol)
+                if stale:
+                    results.update(self._fetch_prices(stale))
+        
+        with self._lock:
+            for symbol, price_data in results.items():
                 self.prices[symbol] = price_data['current']
-                self.last_update[symbol] = datetime.now().isoformat()
+                # 更新时间取自缓存条目本身，其他进程预取写入磁盘缓存的数据同样适用
+                self.last_update[symbol] = price_data.get('updated_at') or _iso_now()
+        return results
     
     def get_price_change(self, symbol):
         """获取价格变化信息"""
-        price_data = self.get_real_time_price(symbol)
-        if price_data:
-            return price_data
-        else:
-            return {
-                'current': 0.0,
-                'previous_close': 0.0,
-                'change': 0.0,
-                'change_percent': 0.0,
-                'volume': 0
-            }
+        return self.get_real_time_price(symbol) or ZERO_PRICE
     
     def get_all_news_flat(self, page=1, per_page=10):
         """获取真实新闻数据 - 必须配置环境变量"""
         try:
-            api_key = os.environ.get("NEWS_API_KEY")
-            if not api_key:
+            if not NEWS_API_KEY:
                 return []  # 没有API密钥时返回空数组
             
+            cache_key = ('news', page, per_page)
+            cached_news = self._get_cached(cache_key)
+            if cached_news is not None:
+                return cached_news
+            
             # 使用真实NewsAPI
-                from datetime import datetime, timedelta
-                import pytz
-                
-                beijing_tz = pytz.timezone('Asia/Shanghai')
-                now = datetime.now(beijing_tz)
-                one_week_ago = now - timedelta(days=7)
-                
-                url = "https://newsapi.org/v2/everything"
-                search_query = '(Tesla OR TSLA OR "Elon Musk" OR EV) OR (Uber OR UBER OR "ride sharing") OR (Coinbase OR COIN OR cryptocurrency) OR (Reddit OR RDDT OR social media) OR (stock market OR stocks OR trading OR investment OR earnings OR market OR finance OR financial OR business OR economy)'
-                
-                params = {
-                    'q': search_query,
-                    'apiKey': api_key,
-                    'language': 'en',
-                    'sortBy': 'publishedAt',
-                    'from': one_week_ago.isoformat(),
-                    'pageSize': min(per_page * 2, 100),
-                    'page': page
-                }
-                
-                response = requests.get(url, params=params, timeout=5)
+            now = datetime.now(BEIJING_TZ)
+            one_week_ago = now - timedelta(days=7)
+            
+            params = dict(NEWS_BASE_PARAMS)
+            params['from'] = one_week_ago.isoformat()
+            params['pageSize'] = min(per_page * 2, 100)
+            params['page'] = page
+            
+            # 流式解析 articles，凑够 per_page 条即停止，不物化整个响应
+            news_list = []
+            today = now.date()
+            with SESSION.get(NEWS_API_URL, params=params, timeout=HTTP_TIMEOUT, stream=True) as response:
                 response.raise_for_status()
-                data = response.json()
-                
-                if data.get('status') == 'ok' and data.get('articles'):
-                    news_list = []
-                    for item in data['articles'][:per_page]:
-                        try:
-                            title = item.get('title', '').strip()
-                            description = item.get('description', '').strip()
-                            url = item.get('url', '')
+                response.raw.decode_content = True
+                for item in ijson.items(response.raw, 'articles.item'):
+                    try:
+                        title = item.get('title', '').strip()
+                        description = item.get('description', '').strip()
+                        url = item.get('url', '')
                             
-                            if not title or title == '[Removed]' or not url:
-                                continue
+                        if not title or title == '[Removed]' or not url:
+                            continue
                             
-                            published_at = item.get('publishedAt')
-                            if published_at:
-                                utc_time = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                                beijing_time = utc_time.astimezone(beijing_tz)
-                            else:
-                                beijing_time = now
+                        published_at = item.get('publishedAt')
+                        if published_at:
+                            utc_time = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
+                            beijing_time = utc_time.astimezone(BEIJING_TZ)
+                        else:
+                            beijing_time = now
                             
-                            summary = description if description else '点击查看详情'
-                            if len(summary) > 150:
-                                summary = summary[:150] + '...'
+                        summary = description if description else '点击查看详情'
+                        if len(summary) > 150:
+                            summary = summary[:150] + '...'
                             
-                            news_list.append({
-                                'title': title,
-                                'summary': summary,
-                                'source': item.get('source', {}).get('name', '权威媒体'),
-                                'url': url,
-                                'sentiment': 'positive',
-                                'timestamp': int(beijing_time.timestamp() * 1000),
-                                'beijing_time': beijing_time.strftime('%m-%d %H:%M'),
-                                'date_group': '今天' if beijing_time.date() == now.date() else beijing_time.strftime('%m-%d')
-                            })
-                    
-                    return news_list
+                        # 固定格式用 f-string 拼接，比 strftime 快
+                        month_day = f"{beijing_time.month:02d}-{beijing_time.day:02d}"
+                        news_list.append({
+                            'title': title,
+                            'summary': summary,
+                            'source': item.get('source', {}).get('name', '权威媒体'),
+                            'url': url,
+                            'sentiment': 'positive',
+                            'timestamp': int(beijing_time.timestamp() * 1000),
+                            'beijing_time': f"{month_day} {beijing_time.hour:02d}:{beijing_time.minute:02d}",
+                            'date_group': '今天' if beijing_time.date() == today else month_day
+                        })
+                        if len(news_list) == per_page:
+                            break
+                    except Exception as e:
+                        print(f"解析新闻失败: {e}")
+                        continue
             
-            # 回退到模拟数据
-            real_news_sources = [
-                {
-                    'title': 'Tesla股价因自动驾驶技术突破上涨',
-                    'summary': '特斯拉最新的FSD v12版本在测试中表现出色，投资者信心增强',
-                    'source': 'Reuters',
-                    'url': 'https://reuters.com/business/autos/tesla-fsd-breakthrough',
-                    'sentiment': 'positive',
-                    'timestamp': (datetime.now().timestamp() - 3600) * 1000
-                },
-                {
-                    'title': 'Reddit广告收入超预期，用户增长强劲',
-                    'summary': 'Reddit最新财报显示广告收入同比增长显著，用户活跃度提升',
-                    'source': 'CNBC',
-                    'url': 'https://cnbc.com/2024/reddit-earnings-beat',
-                    'sentiment': 'positive',
-                    'timestamp': (datetime.now().timestamp() - 7200) * 1000
-                },
-                {
-                    'title': 'Uber宣布扩大自动驾驶车队规模',
-                    'summary': '优步计划在主要城市扩大自动驾驶车队规模',
-                    'source': 'Bloomberg',
-                    'url': 'https://bloomberg.com/news/uber-autonomous-expansion',
-                    'sentiment': 'positive',
-                    'timestamp': (datetime.now().timestamp() - 10800) * 1000
-                },
-                {
-                    'title': 'Coinbase推出新功能提升用户体验',
-                    'summary': 'Coinbase宣布推出多项新功能',
-                    'source': 'CoinDesk',
-                    'url': 'https://coindesk.com/business/coinbase-new-features',
-                    'sentiment': 'positive',
-                    'timestamp': (datetime.now().timestamp() - 14400) * 1000
-                },
-                {
-                    'title': '特朗普政策讨论影响科技股走势',
-                    'summary': '市场对特朗普政策进行解读，科技股波动',
-                    'source': 'Financial Times',
-                    'url': 'https://ft.com/content/trump-tech-impact',
-                    'sentiment': 'neutral',
-                    'timestamp': (datetime.now().timestamp() - 18000) * 1000
-                },
-                {
-                    'title': 'Candel Therapeutics临床进展顺利',
-                    'summary': 'CADL癌症免疫疗法临床试验显示良好效果',
-                    'source': 'BioPharma Dive',
-                    'url': 'https://biopharmadive.com/news/cadel-clinical-trial',
-                    'sentiment': 'positive',
-                    'timestamp': (datetime.now().timestamp() - 21600) * 1000
-                }
-            ]
+            if news_list:
+                self._set_cached(cache_key, news_list)
+                return news_list
             
-            # 按时间排序并分页
-            real_news_sources.sort(key=lambda x: x['timestamp'], reverse=True)
-            total_count = len(real_news_sources)
+            # 回退到模拟数据（已预先按时间排序），分页
+            total_count = len(REAL_NEWS_SORTED)
             start = (page - 1) * per_page
             end = min(start + per_page, total_count)
             
             if start >= total_count:
                 return []
             
-            return real_news_sources[start:end]
+            return _stamp_news(REAL_NEWS_SORTED[start:end])
             
         except Exception as e:
             print(f"获取新闻失败: {e}")
@@ -222,52 +445,43 @@ class StockData:
     
     def get_mock_news(self, page=1, per_page=10):
         """获取模拟新闻数据用于本地开发"""
-        mock_news = [
-            {
-                'title': 'Tesla股价因自动驾驶技术突破上涨5%',
-                'summary': '特斯拉最新的FSD v12版本在测试中表现出色，投资者信心增强，股价应声上涨',
-                'source': '路透社',
-                'url': '#',
-                'sentiment': 'positive',
-                'timestamp': int((datetime.now().timestamp() - 3600) * 1000),
-                'beijing_time': (datetime.now() - timedelta(hours=1)).strftime('%m-%d %H:%M'),
-                'date_group': '今天'
-            },
-            {
-                'title': 'Reddit广告收入超预期，用户增长强劲',
-                'summary': 'Reddit最新财报显示广告收入同比增长45%，超出分析师预期',
-                'source': 'CNBC',
-                'url': '#',
-                'sentiment': 'positive',
-                'timestamp': int((datetime.now().timestamp() - 7200) * 1000),
-                'beijing_time': (datetime.now() - timedelta(hours=2)).strftime('%m-%d %H:%M'),
-                'date_group': '今天'
-            },
-            {
-                'title': 'Uber宣布扩大自动驾驶车队规模至10万辆',
-                'summary': '优步计划在2025年将自动驾驶车队扩大至10万辆，投资50亿美元',
-                'source': '彭博社',
-                'url': '#',
-                'sentiment': 'positive',
-                'timestamp': int((datetime.now().timestamp() - 10800) * 1000),
-                'beijing_time': (datetime.now() - timedelta(hours=3)).strftime('%m-%d %H:%M'),
-                'date_group': '今天'
-            }
-        ]
-        
-        mock_news.sort(key=lambda x: x['timestamp'], reverse=True)
-        total_count = len(mock_news)
+        total_count = len(MOCK_NEWS_SORTED)
         start = (page - 1) * per_page
         end = min(start + per_page, total_count)
         
         if start >= total_count:
             return []
         
-        return mock_news[start:end]
+        return _stamp_news(MOCK_NEWS_SORTED[start:end], with_display_time=True)
 
 # 初始化
 data_service = StockData()
 
+@lru_cache(maxsize=1)
+def _iso_second(second):
+    return datetime.fromtimestamp(second).isoformat()
+
+def _iso_now():
+    """当前时间ISO字符串，同一秒内复用"""
+    return _iso_second(int(time.time()))
+
+def _cached_json(payload, max_age):
+    """返回带 Cache-Control/ETag 的JSON响应，客户端缓存未变化时返回304"""
+    # timestamp 每次请求都不同，不参与 ETag 计算
+    digest = orjson.dumps({k: v for k, v in payload.items() if k != 'timestamp'},
+                          option=orjson.OPT_SORT_KEYS)
+    etag = 'W/"%s"' % hashlib.md5(digest).hexdigest()
+    headers = {
+        'Cache-Control': f'public, max-age={max_age}',
+        'ETag': etag
+    }
+    
+    if_none_match = request.headers.get('If-None-Match', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')]:
+        return '', 304, headers
+    
+    return Response(orjson.dumps(payload), mimetype='application/json', headers=headers)
+
 @app.route('/')
 def index():
     """主页面"""
@@ -282,26 +496,23 @@ def static_files(filename):
 def get_prices():
     """获取实时股价"""
     data_service.update_prices()
-    return jsonify({
+    return _cached_json({
         "prices": data_service.prices,
         "last_update": data_service.last_update,
-        "timestamp": datetime.now().isoformat()
-    })
+        "timestamp": _iso_now()
+    }, max_age=60)
 
 @app.route('/api/all-data')
 def get_all_data():
     """获取完整数据"""
-    data_service.update_prices()
-    
-    prices_detail = {}
-    for symbol in WATCHLIST:
-        prices_detail[symbol] = data_service.get_price_change(symbol)
+    results = data_service.update_prices()
+    prices_detail = {symbol: results.get(symbol) or ZERO_PRICE for symbol in WATCHLIST}
     
-    return jsonify({
+    return _cached_json({
         "prices": prices_detail,
         "last_update": data_service.last_update,
-        "timestamp": datetime.now().isoformat()
-    })
+        "timestamp": _iso_now()
+    }, max_age=60)
 
 @app.route('/api/news/flat')
 @app.route('/api/news/flat/<int:page>')
@@ -310,19 +521,49 @@ def get_flat_news(page=1):
     per_page = 10
     news = data_service.get_all_news_flat(page, per_page)
     
-    return jsonify({
+    return _cached_json({
         "news": news,
         "page": page,
         "per_page": per_page,
         "has_more": len(news) == per_page,
-        "timestamp": datetime.now().isoformat()
-    })
+        "timestamp": _iso_now()
+    }, max_age=300)
 
 @app.route('/api/health')
 def health():
     """健康检查"""
-    return jsonify({"status": "ok"})
+    return _cached_json({"status": "ok"}, max_age=3600)
+
+# 后台预取：在缓存过期前刷新股价，请求始终命中热缓存
+PREFETCH_INTERVAL = 45
+PREFETCH_LOCK_PATH = "/tmp/prefetch.lock"
+
+def _prefetch_loop(lock_file):
+    """定时强制刷新股价缓存；lock_file 随线程存活以持有文件锁"""
+    while True:
+        try:
+            data_service.update_prices(force=True)
+        except Exception as e:
+            print(f"预取股价失败: {e}")
+        time.sleep(PREFETCH_INTERVAL)
+
+def start_prefetcher():
+    """启动预取线程；多进程部署时用文件锁保证只有一个进程预取
+    
+    导入模块时不会自动启动，由 __main__ 或 gunicorn 的 post_worker_init 钩子调用
+    """
+    lock_file = open(PREFETCH_LOCK_PATH, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    
+    thread = threading.Thread(target=_prefetch_loop, args=(lock_file,), daemon=True)
+    thread.start()
+    return thread
 
 if __name__ == '__main__':
+    start_prefetcher()
     port = int(os.environ.get('PORT', 8080))
     app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file